@@ -1,14 +1,22 @@
+from .aabb import AABB, intersect_boxes, stack_bounds
 from .base import BaseObject, Intersection, Material
+from .bvh import BVH
 from .ray import Ray, reflect, refract
 from .sphere import Sphere
 from .triangle import Triangle
-from .vector import Vector
+from .vector import Vector, VectorArray
 
 __all__ = (
+    'AABB',
+    'intersect_boxes',
+    'stack_bounds',
+
     'BaseObject',
     'Intersection',
     'Material',
 
+    'BVH',
+
     'Ray',
     'reflect',
     'refract',
@@ -18,4 +26,5 @@ __all__ = (
     'Triangle',
 
     'Vector',
+    'VectorArray',
 )
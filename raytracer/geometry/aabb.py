@@ -0,0 +1,87 @@
+import attr
+import math
+import numpy as np
+from typing import Sequence
+
+from .ray import Ray
+from .vector import Vector
+
+
+@attr.s(slots=True)
+class AABB:
+    min: Vector = attr.ib()
+    max: Vector = attr.ib()
+
+    @classmethod
+    def from_points(cls, *points: Vector) -> "AABB":
+        return cls(
+            Vector(*(min(p[axis] for p in points) for axis in range(3))),
+            Vector(*(max(p[axis] for p in points) for axis in range(3))),
+        )
+
+    def union(self, other: "AABB") -> "AABB":
+        return AABB.from_points(self.min, self.max, other.min, other.max)
+
+    @property
+    def centroid(self) -> Vector:
+        return (self.min + self.max) / 2
+
+    @property
+    def surface_area(self) -> float:
+        """
+        Calculate surface area of a box (used as hit probability estimate by SAH).
+
+        :return: surface area
+        """
+
+        dx, dy, dz = (self.max - self.min).to_tuple()
+        return 2 * (dx * dy + dy * dz + dz * dx)
+
+
+def stack_bounds(boxes: Sequence[AABB]):
+    """
+    Pack boxes into a pair of arrays suitable for intersect_boxes.
+
+    :param boxes: sequence of boxes
+    :return: tuple of arrays of min and max corners, each of shape (n, 3)
+    """
+
+    mins = np.array([box.min.to_tuple() for box in boxes], dtype=float).reshape(-1, 3)
+    maxs = np.array([box.max.to_tuple() for box in boxes], dtype=float).reshape(-1, 3)
+    return mins, maxs
+
+
+def intersect_boxes(ray: Ray, mins, maxs, t_max: float = math.inf):
+    """
+    Intersect a single ray with many boxes at once using the slab test.
+
+    Notes:
+        - axes along which a ray is parallel to the slabs are handled explicitly (no NaNs)
+        - boxes behind the ray origin are rejected, boxes containing the origin are hit at distance 0
+
+    :param ray: a ray to intersect boxes with
+    :param mins: array of min box corners of shape (n, 3)
+    :param maxs: array of max box corners of shape (n, 3)
+    :param t_max: upper bound on the hit distance
+    :return: tuple of a boolean hit mask and an array of entry distances, both of shape (n,)
+    """
+
+    origin = ray.origin.to_array()
+    direction = ray.direction.to_array()
+    parallel = direction == 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv_dir = 1 / direction
+        t1 = (mins - origin) * inv_dir
+        t2 = (maxs - origin) * inv_dir
+
+    t_lo = np.minimum(t1, t2)
+    t_hi = np.maximum(t1, t2)
+    if parallel.any():
+        inside = (mins <= origin) & (origin <= maxs)
+        t_lo = np.where(parallel, np.where(inside, -math.inf, math.inf), t_lo)
+        t_hi = np.where(parallel, np.where(inside, math.inf, -math.inf), t_hi)
+
+    t_near = np.maximum(t_lo.max(axis=-1), 0)
+    t_far = np.minimum(t_hi.min(axis=-1), t_max)
+    return t_near <= t_far, t_near
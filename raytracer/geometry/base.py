@@ -1,5 +1,6 @@
 import attr
 
+from .aabb import AABB
 from .ray import Ray
 from .vector import Vector
 
@@ -40,3 +41,6 @@ class BaseObject:
 
     def has_volume(self) -> bool:
         raise NotImplementedError()
+
+    def bounds(self) -> AABB:
+        raise NotImplementedError()
@@ -0,0 +1,256 @@
+import math
+import numpy as np
+from typing import Iterable
+
+from .aabb import stack_bounds
+from .base import BaseObject, Intersection
+from .ray import Ray
+
+
+PADDING = 1e-7
+
+
+def _surface_area(lo, hi):
+    d = np.maximum(hi - lo, 0)
+    return 2 * (d[..., 0] * d[..., 1] + d[..., 1] * d[..., 2] + d[..., 2] * d[..., 0])
+
+
+class BVH:
+    """
+    Bounding volume hierarchy over scene objects built with binned surface area heuristic (SAH).
+
+    Nodes are stored in flat lists, so that traversal does not allocate anything but a small stack.
+    A leaf node references a contiguous range of objects in `self._objects`.
+    """
+
+    def __init__(
+        self,
+        objects: Iterable[BaseObject],
+        *,
+        num_bins: int = 12,
+        max_leaf_size: int = 4,
+        traversal_cost: float = 1.,
+    ):
+        objects = list(objects)
+
+        self._min: list[tuple[float, float, float]] = []
+        self._max: list[tuple[float, float, float]] = []
+        self._left: list[int] = []
+        self._right: list[int] = []
+        self._first: list[int] = []
+        self._count: list[int] = []
+        self._objects: list[BaseObject] = []
+
+        if objects:
+            self._build(objects, num_bins, max_leaf_size, traversal_cost)
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self._count)
+
+    def _new_node(self) -> int:
+        self._min.append(None)
+        self._max.append(None)
+        self._left.append(-1)
+        self._right.append(-1)
+        self._first.append(0)
+        self._count.append(0)
+        return len(self._count) - 1
+
+    def _build(self, objects: list[BaseObject], num_bins: int, max_leaf_size: int, traversal_cost: float) -> None:
+        mins, maxs = stack_bounds([obj.bounds() for obj in objects])
+        mins -= PADDING
+        maxs += PADDING
+        centroids = (mins + maxs) / 2
+        order = np.arange(len(objects))
+
+        stack = [(self._new_node(), 0, len(objects))]
+        while stack:
+            node, start, end = stack.pop()
+            idx = order[start:end]
+            lo, hi = mins[idx].min(axis=0), maxs[idx].max(axis=0)
+            self._min[node] = tuple(lo.tolist())
+            self._max[node] = tuple(hi.tolist())
+
+            split = self._find_split(idx, mins, maxs, centroids, lo, hi, num_bins, traversal_cost)
+            if split is None or (len(idx) <= max_leaf_size and split[0] >= len(idx)):
+                self._first[node] = len(self._objects)
+                self._count[node] = len(idx)
+                self._objects.extend(objects[i] for i in idx)
+                continue
+
+            _, go_left = split
+            order[start:end] = np.concatenate((idx[go_left], idx[~go_left]))
+            middle = start + int(go_left.sum())
+
+            left, right = self._new_node(), self._new_node()
+            self._left[node], self._right[node] = left, right
+            stack.append((right, middle, end))
+            stack.append((left, start, middle))
+
+    @staticmethod
+    def _find_split(idx, mins, maxs, centroids, lo, hi, num_bins, traversal_cost):
+        """
+        Find the cheapest binned SAH split of a node.
+
+        :return: tuple of split cost and a mask of objects going to the left child, or None
+        """
+
+        parent_area = _surface_area(lo, hi)
+        if len(idx) < 2 or parent_area <= 0:
+            return None
+
+        node_centroids = centroids[idx]
+        c_min, c_max = node_centroids.min(axis=0), node_centroids.max(axis=0)
+
+        best = None
+        for axis in range(3):
+            extent = c_max[axis] - c_min[axis]
+            if extent <= 0:
+                continue
+
+            bins = ((node_centroids[:, axis] - c_min[axis]) * (num_bins / extent)).astype(int)
+            np.clip(bins, 0, num_bins - 1, out=bins)
+
+            counts = np.bincount(bins, minlength=num_bins)
+            bin_min = np.full((num_bins, 3), math.inf)
+            bin_max = np.full((num_bins, 3), -math.inf)
+            np.minimum.at(bin_min, bins, mins[idx])
+            np.maximum.at(bin_max, bins, maxs[idx])
+
+            left_count = np.cumsum(counts)[:-1]
+            left_area = _surface_area(np.minimum.accumulate(bin_min)[:-1], np.maximum.accumulate(bin_max)[:-1])
+            right_count = np.cumsum(counts[::-1])[::-1][1:]
+            right_area = _surface_area(
+                np.minimum.accumulate(bin_min[::-1])[::-1][1:],
+                np.maximum.accumulate(bin_max[::-1])[::-1][1:],
+            )
+
+            cost = traversal_cost + (left_area * left_count + right_area * right_count) / parent_area
+            cost[(left_count == 0) | (right_count == 0)] = math.inf
+            k = int(cost.argmin())
+            if best is None or cost[k] < best[0]:
+                best = (float(cost[k]), bins <= k)
+
+        return best
+
+    def _enter_distance(self, node: int, origin, inv_dir, t_max: float) -> float | None:
+        """
+        Intersect a ray with a node box using the slab test.
+
+        :return: distance at which a ray enters the box, or None if it misses the box within t_max
+        """
+
+        t_near, t_far = 0., t_max
+        lo, hi = self._min[node], self._max[node]
+        for axis in range(3):
+            inv = inv_dir[axis]
+            o = origin[axis]
+            if inv is None:
+                if o < lo[axis] or o > hi[axis]:
+                    return None
+                continue
+
+            t1 = (lo[axis] - o) * inv
+            t2 = (hi[axis] - o) * inv
+            if t1 > t2:
+                t1, t2 = t2, t1
+            if t1 > t_near:
+                t_near = t1
+            if t2 < t_far:
+                t_far = t2
+            if t_near > t_far:
+                return None
+
+        return t_near
+
+    @staticmethod
+    def _prepare(ray: Ray):
+        origin = ray.origin.to_tuple()
+        inv_dir = tuple(1 / d if d != 0 else None for d in ray.direction.to_tuple())
+        return origin, inv_dir
+
+    def closest_intersection(self, ray: Ray) -> tuple[Intersection | None, BaseObject | None]:
+        """
+        Find the closest intersection of a ray with the objects in the hierarchy.
+
+        :param ray: a ray to intersect with objects
+        :return: tuple of found intersection and an object, or two Nones
+        """
+
+        closest_intersection, closest_obj = None, None
+        if not self._objects:
+            return closest_intersection, closest_obj
+
+        origin, inv_dir = self._prepare(ray)
+        best = math.inf
+
+        t_root = self._enter_distance(0, origin, inv_dir, best)
+        stack = [] if t_root is None else [(t_root, 0)]
+        while stack:
+            t_near, node = stack.pop()
+            if t_near > best:
+                continue
+
+            count = self._count[node]
+            if count:
+                first = self._first[node]
+                for obj in self._objects[first:first + count]:
+                    intersection = obj.intersect(ray)
+                    if intersection is not None and intersection.distance < best:
+                        closest_intersection, closest_obj = intersection, obj
+                        best = intersection.distance
+                continue
+
+            left, right = self._left[node], self._right[node]
+            t_left = self._enter_distance(left, origin, inv_dir, best)
+            t_right = self._enter_distance(right, origin, inv_dir, best)
+            if t_left is not None and t_right is not None:
+                if t_left <= t_right:
+                    stack.append((t_right, right))
+                    stack.append((t_left, left))
+                else:
+                    stack.append((t_left, left))
+                    stack.append((t_right, right))
+            elif t_left is not None:
+                stack.append((t_left, left))
+            elif t_right is not None:
+                stack.append((t_right, right))
+
+        return closest_intersection, closest_obj
+
+    def any_intersection(self, ray: Ray, max_distance: float) -> BaseObject | None:
+        """
+        Find any object intersecting a ray closer than max_distance.
+
+        :param ray: a ray to intersect with objects
+        :param max_distance: upper bound on the intersection distance (exclusive)
+        :return: an intersected object, or None
+        """
+
+        if not self._objects:
+            return None
+
+        origin, inv_dir = self._prepare(ray)
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._enter_distance(node, origin, inv_dir, max_distance) is None:
+                continue
+
+            count = self._count[node]
+            if count:
+                first = self._first[node]
+                for obj in self._objects[first:first + count]:
+                    intersection = obj.intersect(ray)
+                    if intersection is not None and intersection.distance < max_distance:
+                        return obj
+                continue
+
+            stack.append(self._right[node])
+            stack.append(self._left[node])
+
+        return None
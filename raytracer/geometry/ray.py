@@ -25,7 +25,7 @@ def reflect(direction: Vector, normal: Vector) -> Vector:
     :return: direction of the reflected ray
     """
 
-    raise NotImplementedError
+    return direction - normal * (2 * direction.dot(normal))
 
 
 def refract(direction: Vector, normal: Vector, eta: float) -> Vector | None:
@@ -42,4 +42,9 @@ def refract(direction: Vector, normal: Vector, eta: float) -> Vector | None:
     :return: direction of the refracted ray, or None
     """
 
-    raise NotImplementedError
+    cos_in = -direction.dot(normal)
+    sin2_out = eta * eta * (1 - cos_in * cos_in)
+    if sin2_out > 1:
+        return None
+
+    return direction * eta + normal * (eta * cos_in - math.sqrt(1 - sin2_out))
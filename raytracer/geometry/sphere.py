@@ -1,6 +1,7 @@
 import attr
 import math
 
+from .aabb import AABB
 from .base import BaseObject, Intersection, Ray
 from .vector import Vector
 
@@ -19,7 +20,22 @@ def solve_quadratic(a, b, c) -> tuple[float, float] | None:
     :raises RuntimeError: infinity solutions
     """
 
-    raise NotImplementedError
+    if a == 0:
+        if b == 0:
+            if c == 0:
+                raise RuntimeError('Infinitely many solutions.')
+            return None
+        root = -c / b
+        return root, root
+
+    discriminant = b * b - 4 * a * c
+    if discriminant < 0:
+        return None
+
+    sqrt_d = math.sqrt(discriminant)
+    x1 = (-b - sqrt_d) / (2 * a)
+    x2 = (-b + sqrt_d) / (2 * a)
+    return (x1, x2) if x1 <= x2 else (x2, x1)
 
 
 @attr.s(slots=True, kw_only=True)
@@ -41,7 +57,27 @@ class Sphere(BaseObject):
         :return: intersection object, or None
         """
 
-        raise NotImplementedError
+        to_origin = ray.origin - self.center
+        roots = solve_quadratic(
+            ray.direction.dot(ray.direction),
+            2 * ray.direction.dot(to_origin),
+            to_origin.dot(to_origin) - self.radius * self.radius,
+        )
+        if roots is None:
+            return None
+
+        t1, t2 = roots
+        if t2 < 0:
+            return None
+
+        inside = t1 < 0
+        distance = t2 if inside else t1
+        position = ray.origin + ray.direction * distance
+        normal = self.get_normal(position)
+        if inside:
+            normal = -normal
+
+        return Intersection(position, normal, distance)
 
     def get_normal(self, point: Vector) -> Vector:
         """
@@ -55,7 +91,10 @@ class Sphere(BaseObject):
         :return: outer normal vector
         """
 
-        raise NotImplementedError
+        return (point - self.center) / self.radius
 
     def has_volume(self) -> bool:
         return True
+
+    def bounds(self) -> AABB:
+        return AABB(self.center - Vector(self.radius), self.center + Vector(self.radius))
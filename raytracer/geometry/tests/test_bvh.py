@@ -0,0 +1,105 @@
+import numpy as np
+
+from .. import AABB, BVH, Ray, Sphere, Triangle, Vector, intersect_boxes, stack_bounds
+
+
+def make_objects(rng, n):
+    objects = []
+    for _ in range(n):
+        center = Vector.from_array(rng.uniform(-5, 5, size=3))
+        if rng.random() < 0.5:
+            objects.append(Sphere(center=center, radius=rng.uniform(0.1, 0.5)))
+        else:
+            objects.append(Triangle([center + Vector.from_array(rng.uniform(-0.5, 0.5, size=3)) for _ in range(3)]))
+    return objects
+
+
+def brute_force_closest(objects, ray):
+    best, best_obj = None, None
+    for obj in objects:
+        intersection = obj.intersect(ray)
+        if intersection is not None and (best is None or intersection.distance < best.distance):
+            best, best_obj = intersection, obj
+    return best, best_obj
+
+
+class TestBVH:
+    def test_empty(self):
+        bvh = BVH([])
+        ray = Ray(origin=Vector(0, 0, 0), direction=Vector(0, 0, -1))
+        assert bvh.closest_intersection(ray) == (None, None)
+        assert bvh.any_intersection(ray, 1) is None
+
+    def test_bounds(self):
+        box = Sphere(center=Vector(1, 2, 3), radius=1).bounds()
+        assert box.min == Vector(0, 1, 2)
+        assert box.max == Vector(2, 3, 4)
+
+        box = Triangle([Vector(0, 2, 1), Vector(-1, 0, 4), Vector(3, 1, 0)]).bounds()
+        assert box.min == Vector(-1, 0, 0)
+        assert box.max == Vector(3, 2, 4)
+
+    def test_closest_matches_brute_force(self):
+        rng = np.random.default_rng(47)
+        objects = make_objects(rng, 200)
+        bvh = BVH(objects)
+        assert len(bvh) == len(objects)
+        assert bvh.num_nodes > 1
+
+        for _ in range(300):
+            origin = Vector.from_array(rng.uniform(-6, 6, size=3))
+            direction = Vector.from_array(rng.normal(size=3))
+            ray = Ray(origin=origin, direction=direction)
+
+            expected, expected_obj = brute_force_closest(objects, ray)
+            intersection, obj = bvh.closest_intersection(ray)
+            assert obj is expected_obj
+            if expected is not None:
+                assert np.allclose(intersection.distance, expected.distance)
+
+    def test_axis_aligned_rays(self):
+        objects = [Triangle([Vector(0, 0, -1), Vector(1, 0, -1), Vector(0, 1, -1)])]
+        objects += [Sphere(center=Vector(5, 5, -5), radius=1)]
+        bvh = BVH(objects)
+
+        intersection, obj = bvh.closest_intersection(Ray(origin=Vector(0.2, 0.2, 0), direction=Vector(0, 0, -1)))
+        assert obj is objects[0]
+        assert np.allclose(intersection.distance, 1)
+
+        assert bvh.any_intersection(Ray(origin=Vector(0.2, 0.2, 0), direction=Vector(0, 0, -1)), 0.5) is None
+        assert bvh.any_intersection(Ray(origin=Vector(5, 5, 0), direction=Vector(0, 0, -1)), 10) is objects[1]
+
+
+class TestIntersectBoxes:
+    def test_conservative(self):
+        rng = np.random.default_rng(42)
+        objects = make_objects(rng, 500)
+        mins, maxs = stack_bounds([obj.bounds() for obj in objects])
+
+        for _ in range(50):
+            ray = Ray(
+                origin=Vector.from_array(rng.uniform(-6, 6, size=3)),
+                direction=Vector.from_array(rng.normal(size=3)),
+            )
+            hit, t_near = intersect_boxes(ray, mins, maxs)
+            for obj, box_hit, t in zip(objects, hit, t_near):
+                intersection = obj.intersect(ray)
+                if intersection is not None:
+                    assert box_hit
+                    assert t <= intersection.distance + 1e-9
+
+    def test_parallel_ray(self):
+        mins, maxs = stack_bounds([
+            AABB(Vector(-1, -1, -3), Vector(1, 1, -2)),
+            AABB(Vector(2, -1, -3), Vector(3, 1, -2)),
+            AABB(Vector(-1, -1, 2), Vector(1, 1, 3)),
+            AABB(Vector(-1, -1, -0.5), Vector(1, 1, 0.5)),
+        ])
+        ray = Ray(origin=Vector(0, 0, 0), direction=Vector(0, 0, -1))
+
+        hit, t_near = intersect_boxes(ray, mins, maxs)
+        assert hit.tolist() == [True, False, False, True]
+        assert np.allclose(t_near[[0, 3]], [2, 0])
+
+        hit, _ = intersect_boxes(ray, mins, maxs, t_max=1.5)
+        assert hit.tolist() == [False, False, False, True]
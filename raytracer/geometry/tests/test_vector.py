@@ -2,7 +2,7 @@ import math
 import numpy as np
 
 from ..ray import reflect, refract
-from ..vector import Vector
+from ..vector import Vector, VectorArray
 
 
 class TestVector:
@@ -64,3 +64,44 @@ class TestVector:
         refracted = refract(ray, normal, 0.9)
         assert np.allclose(refracted.x, 0.636396)
         assert np.allclose(refracted.y, -0.771362)
+
+
+class TestVectorArray:
+    def test_conversions(self):
+        data = np.arange(12, dtype=float).reshape(4, 3)
+        arr = VectorArray.from_array(data)
+        assert arr.to_array() is data
+        assert len(arr) == 4
+        assert arr[1] == Vector(3, 4, 5)
+        assert np.shares_memory(arr[1:].to_array(), data)
+        assert VectorArray.from_vectors(arr.to_vectors()) == arr
+
+    def test_matches_vector(self):
+        rng = np.random.default_rng(47)
+        a = VectorArray(rng.normal(size=(16, 3)))
+        b = VectorArray(rng.normal(size=(16, 3)))
+        va, vb = a.to_vectors(), b.to_vectors()
+
+        assert np.allclose(a.dot(b), [u.dot(v) for u, v in zip(va, vb)])
+        assert np.allclose(a.length, [u.length for u in va])
+        assert a.cross(b) == VectorArray.from_vectors([u.cross(v) for u, v in zip(va, vb)])
+        assert a.hadamard(b) == VectorArray.from_vectors([u.hadamard(v) for u, v in zip(va, vb)])
+        assert a + b == VectorArray.from_vectors([u + v for u, v in zip(va, vb)])
+        assert a - b == -(b - a)
+        assert a * 3 == 3 * a == a + 2 * a
+        assert a / 2. == a * 0.5
+
+        normalized = VectorArray(a.to_array().copy()).normalize()
+        assert np.allclose(normalized.length, 1)
+
+    def test_broadcasting(self):
+        a = VectorArray([[1, 0, 0], [0, 2, 0], [0, 0, 0]])
+        assert a + Vector(1) == VectorArray([[2, 1, 1], [1, 3, 1], [1, 1, 1]])
+        assert np.allclose(a.dot(Vector(1, 1, 1)), [1, 2, 0])
+        assert a * np.array([2, 3, 4]) == VectorArray([[2, 0, 0], [0, 6, 0], [0, 0, 0]])
+
+        a.normalize()
+        assert a == VectorArray([[1, 0, 0], [0, 1, 0], [0, 0, 0]])
+
+        a /= np.array([1, 2, 1])
+        assert a[1] == Vector(0, 0.5, 0)
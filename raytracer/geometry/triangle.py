@@ -1,6 +1,7 @@
 import attr
 from typing import Any, Sequence
 
+from .aabb import AABB
 from .vector import Vector
 from .base import BaseObject, Intersection, Ray
 
@@ -21,7 +22,7 @@ def get_triangle_area(v1: Vector, v2: Vector, v3: Vector) -> float:
     :return: triangle area
     """
 
-    raise NotImplementedError
+    return (v2 - v1).cross(v3 - v1).length / 2
 
 
 @attr.s(slots=True, init=False)
@@ -55,7 +56,36 @@ class Triangle(BaseObject):
         :return: intersection, or None
         """
 
-        raise NotImplementedError
+        v0, v1, v2 = self._vertices
+        edge1 = v1 - v0
+        edge2 = v2 - v0
+
+        p = ray.direction.cross(edge2)
+        det = edge1.dot(p)
+        if abs(det) < EPS:
+            return None
+
+        inv_det = 1 / det
+        s = ray.origin - v0
+        u = s.dot(p) * inv_det
+        if u < 0 or u > 1:
+            return None
+
+        q = s.cross(edge1)
+        v = ray.direction.dot(q) * inv_det
+        if v < 0 or u + v > 1:
+            return None
+
+        distance = edge2.dot(q) * inv_det
+        if distance < EPS:
+            return None
+
+        position = ray.origin + ray.direction * distance
+        normal = edge1.cross(edge2).normalize()
+        if normal.dot(ray.direction) > 0:
+            normal = -normal
+
+        return Intersection(position, normal, distance)
 
     def get_barycentric_coords(self, point: Vector) -> Vector:
         """
@@ -70,7 +100,16 @@ class Triangle(BaseObject):
         :return: vector of barycentric coordinates
         """
 
-        raise NotImplementedError
+        v0, v1, v2 = self._vertices
+        area = get_triangle_area(v0, v1, v2)
+        return Vector(
+            get_triangle_area(point, v1, v2) / area,
+            get_triangle_area(v0, point, v2) / area,
+            get_triangle_area(v0, v1, point) / area,
+        )
 
     def has_volume(self) -> bool:
         return False
+
+    def bounds(self) -> AABB:
+        return AABB.from_points(*self._vertices)
@@ -36,7 +36,7 @@ class Vector:
         :return: vector length (L2 norm)
         """
 
-        raise NotImplementedError
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
 
     def normalize(self) -> "Vector":
         """
@@ -45,7 +45,10 @@ class Vector:
         :return: self
         """
 
-        raise NotImplementedError
+        length = self.length
+        if length > 0:
+            self /= length
+        return self
 
     def dot(self, other: "Vector") -> float:
         """
@@ -55,7 +58,7 @@ class Vector:
         :return: dot product
         """
 
-        raise NotImplementedError
+        return self.x * other.x + self.y * other.y + self.z * other.z
 
     def cross(self, other: "Vector") -> "Vector":
         """
@@ -65,7 +68,11 @@ class Vector:
         :return: cross product
         """
 
-        raise NotImplementedError
+        return Vector(
+            self.y * other.z - self.z * other.y,
+            self.z * other.x - self.x * other.z,
+            self.x * other.y - self.y * other.x,
+        )
 
     def __add__(self, other: "Vector") -> "Vector":
         """
@@ -75,7 +82,7 @@ class Vector:
         :return: new vector
         """
 
-        raise NotImplementedError
+        return Vector(self.x + other.x, self.y + other.y, self.z + other.z)
 
     def __iadd__(self, other: "Vector") -> "Vector":
         """
@@ -85,7 +92,10 @@ class Vector:
         :return: self
         """
 
-        raise NotImplementedError
+        self.x += other.x
+        self.y += other.y
+        self.z += other.z
+        return self
 
     def __sub__(self, other: "Vector") -> "Vector":
         """
@@ -95,7 +105,7 @@ class Vector:
         :return: new vector
         """
 
-        raise NotImplementedError
+        return Vector(self.x - other.x, self.y - other.y, self.z - other.z)
 
     def __isub__(self, other: "Vector") -> "Vector":
         """
@@ -105,7 +115,10 @@ class Vector:
         :return: self
         """
 
-        raise NotImplementedError
+        self.x -= other.x
+        self.y -= other.y
+        self.z -= other.z
+        return self
 
     def __neg__(self) -> "Vector":
         """
@@ -114,7 +127,7 @@ class Vector:
         :return: new vector
         """
 
-        raise NotImplementedError
+        return Vector(-self.x, -self.y, -self.z)
 
     def __mul__(self, other: float) -> "Vector":
         """
@@ -124,7 +137,7 @@ class Vector:
         :return: new vector
         """
 
-        raise NotImplementedError
+        return Vector(self.x * other, self.y * other, self.z * other)
 
     def __rmul__(self, other: float) -> "Vector":
         """
@@ -134,7 +147,7 @@ class Vector:
         :return: new vector
         """
 
-        raise NotImplementedError
+        return self * other
 
     def __imul__(self, other: float) -> "Vector":
         """
@@ -144,7 +157,10 @@ class Vector:
         :return: self
         """
 
-        raise NotImplementedError
+        self.x *= other
+        self.y *= other
+        self.z *= other
+        return self
 
     def hadamard(self, other: "Vector") -> "Vector":
         """
@@ -154,7 +170,7 @@ class Vector:
         :return: new vector
         """
 
-        raise NotImplementedError
+        return Vector(self.x * other.x, self.y * other.y, self.z * other.z)
 
     def __truediv__(self, other: float) -> "Vector":
         """
@@ -164,7 +180,7 @@ class Vector:
         :return: new vector
         """
 
-        raise NotImplementedError
+        return Vector(self.x / other, self.y / other, self.z / other)
 
     def __itruediv__(self, other: float) -> "Vector":
         """
@@ -174,7 +190,10 @@ class Vector:
         :return: self
         """
 
-        raise NotImplementedError
+        self.x /= other
+        self.y /= other
+        self.z /= other
+        return self
 
     def to_tuple(self) -> tuple[float, float, float]:
         return (self.x, self.y, self.z)
@@ -184,3 +203,173 @@ class Vector:
 
     def __eq__(self, other: "Vector") -> bool:
         return np.allclose(self.to_tuple(), other.to_tuple())
+
+
+class VectorArray:
+    """
+    Array of N vectors backed by a single (N, 3) numpy array.
+
+    Mirrors the Vector API, but every operation is a single numpy call over all the vectors.
+    Right-hand side operands may be VectorArray, Vector (broadcast to every row), numbers or arrays of N numbers.
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, data, /):
+        data = np.asarray(data, dtype=float)
+        if data.ndim != 2 or data.shape[1] != 3:
+            raise ValueError(f"expected an array of shape (N, 3), got {data.shape}")
+        self.data = data
+
+    @classmethod
+    def from_array(cls, arr) -> "VectorArray":
+        """
+        Wrap an (N, 3) array; no copy is made for float64 input.
+
+        :param arr: array-like of shape (N, 3)
+        :return: new vector array sharing memory with arr whenever possible
+        """
+
+        return cls(arr)
+
+    @classmethod
+    def from_vectors(cls, vectors) -> "VectorArray":
+        return cls(np.array([v.to_tuple() for v in vectors], dtype=float).reshape(-1, 3))
+
+    @classmethod
+    def full(cls, n: int, vector: Vector) -> "VectorArray":
+        return cls(np.tile(vector.to_array(), (n, 1)))
+
+    @classmethod
+    def zeros(cls, n: int) -> "VectorArray":
+        return cls(np.zeros((n, 3), dtype=float))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return f"VectorArray(n={len(self)})"
+
+    def __getitem__(self, idx):
+        """
+        Index the array: an integer gives a Vector copy, anything else (slices, masks, index arrays) a VectorArray.
+
+        :param idx: index
+        :return: Vector or VectorArray
+        """
+
+        if isinstance(idx, (int, np.integer)):
+            return Vector.from_array(self.data[idx])
+        return VectorArray(self.data[idx])
+
+    def __setitem__(self, idx, value) -> None:
+        self.data[idx] = _as_operand(value)
+
+    @property
+    def x(self):
+        return self.data[:, 0]
+
+    @property
+    def y(self):
+        return self.data[:, 1]
+
+    @property
+    def z(self):
+        return self.data[:, 2]
+
+    @property
+    def length(self):
+        """
+        Find lengths of all vectors.
+
+        :return: array of N lengths (L2 norms)
+        """
+
+        return np.sqrt(self.dot(self))
+
+    def normalize(self) -> "VectorArray":
+        """
+        Normalize all vectors in-place, so that each has length 1 (zero vectors are left as is).
+
+        :return: self
+        """
+
+        length = self.length
+        np.divide(self.data, length[:, None], out=self.data, where=length[:, None] > 0)
+        return self
+
+    def dot(self, other: "VectorArray | Vector"):
+        """
+        Calculate row-wise dot products.
+
+        :param other: right-hand side operand
+        :return: array of N dot products
+        """
+
+        return np.einsum('ij,ij->i', self.data, np.broadcast_to(_as_operand(other), self.data.shape))
+
+    def cross(self, other: "VectorArray | Vector") -> "VectorArray":
+        return VectorArray(np.cross(self.data, _as_operand(other)))
+
+    def hadamard(self, other: "VectorArray | Vector") -> "VectorArray":
+        return VectorArray(self.data * _as_operand(other))
+
+    def __add__(self, other: "VectorArray | Vector") -> "VectorArray":
+        return VectorArray(self.data + _as_operand(other))
+
+    __radd__ = __add__
+
+    def __iadd__(self, other: "VectorArray | Vector") -> "VectorArray":
+        self.data += _as_operand(other)
+        return self
+
+    def __sub__(self, other: "VectorArray | Vector") -> "VectorArray":
+        return VectorArray(self.data - _as_operand(other))
+
+    def __rsub__(self, other: "VectorArray | Vector") -> "VectorArray":
+        return VectorArray(_as_operand(other) - self.data)
+
+    def __isub__(self, other: "VectorArray | Vector") -> "VectorArray":
+        self.data -= _as_operand(other)
+        return self
+
+    def __neg__(self) -> "VectorArray":
+        return VectorArray(-self.data)
+
+    def __mul__(self, other) -> "VectorArray":
+        return VectorArray(self.data * _as_scalars(other))
+
+    __rmul__ = __mul__
+
+    def __imul__(self, other) -> "VectorArray":
+        self.data *= _as_scalars(other)
+        return self
+
+    def __truediv__(self, other) -> "VectorArray":
+        return VectorArray(self.data / _as_scalars(other))
+
+    def __itruediv__(self, other) -> "VectorArray":
+        self.data /= _as_scalars(other)
+        return self
+
+    def to_array(self):
+        return self.data
+
+    def to_vectors(self) -> list[Vector]:
+        return [Vector(*row) for row in self.data.tolist()]
+
+    def __eq__(self, other: "VectorArray") -> bool:
+        return self.data.shape == other.data.shape and np.allclose(self.data, other.data)
+
+
+def _as_operand(value):
+    if isinstance(value, VectorArray):
+        return value.data
+    if isinstance(value, Vector):
+        return value.to_array()
+    return np.asarray(value, dtype=float)
+
+
+def _as_scalars(value):
+    value = np.asarray(value, dtype=float)
+    return value[:, None] if value.ndim == 1 else value
@@ -1,7 +1,8 @@
-from .scene import CameraOptions, PointLight, Scene
+from .scene import CameraOptions, PointLight, RenderPool, Scene
 
 __all__ = (
     'CameraOptions',
     'PointLight',
+    'RenderPool',
     'Scene',
 )
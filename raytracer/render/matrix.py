@@ -30,7 +30,14 @@ def look_at(look_from: Vector, look_to: Vector, eps: float = 1e-8) -> Matrix:
     :return: transformation (projection) matrix
     """
 
-    raise NotImplementedError
+    forward = (look_from - look_to).normalize()
+    right = Vector(0, 1, 0).cross(forward)
+    if right.length < eps:
+        right = Vector(1, 0, 0)
+    right.normalize()
+    up = forward.cross(right)
+
+    return Matrix(right, up, forward, look_from)
 
 
 def vector_matrix_multiply(matrix: Matrix, vector: Vector) -> Vector:
@@ -3,11 +3,16 @@ import math
 import numpy as np
 import tqdm
 import multiprocessing
+import pickle
+import weakref
+from multiprocessing import resource_tracker, shared_memory
 
 from PIL import Image
 
-from ..geometry import BaseObject, Intersection, Ray, Vector, reflect, refract
+from ..geometry import BVH, BaseObject, Intersection, Ray, Vector, reflect, refract
 from .matrix import look_at, point_matrix_multiply, vector_matrix_multiply
+from . import vectorized, wavefront
+from .tiles import DEFAULT_TILE_SIZE, Tile, make_tiles
 
 
 EPS = 1e-8
@@ -40,35 +45,61 @@ class Scene:
     lights: list[PointLight] = attr.ib(factory=list, init=False)
 
     _cached_last_intersected: BaseObject | None = attr.ib(default=None, init=False)
+    _bvh: BVH | None = attr.ib(default=None, init=False)
+    _version: int = attr.ib(default=0, init=False)
 
     def add_object(self, obj: BaseObject) -> None:
         self.objects.append(obj)
+        self._bvh = None
+        self._version += 1
+
+    @property
+    def version(self) -> int:
+        """
+        Counter of scene updates, bumped whenever an object or a light is added.
+
+        :return: scene version
+        """
+
+        return self._version
+
+    @property
+    def bvh(self) -> BVH:
+        """
+        Bounding volume hierarchy over the scene objects, (re)built lazily after objects are added.
+
+        :return: BVH instance
+        """
+
+        if self._bvh is None:
+            self._bvh = BVH(self.objects)
+        return self._bvh
 
     def add_light(self, light: PointLight) -> None:
         self.lights.append(light)
+        self._version += 1
 
     def find_closest_intersection(self, ray: Ray) -> tuple[Intersection | None, BaseObject | None]:
         """
         Find intersection of a ray with the first object in the scene.
 
         Notes:
-            - implementation is straight-forward
+            - objects are traversed via the scene BVH, so only the boxes along the ray are visited
             - you need the closest intersection!
 
         :param ray: a ray to intersect with objects
         :return: tuple of found intersection and an object, or two Nones
         """
 
-        raise NotImplementedError
+        return self.bvh.closest_intersection(ray)
 
     def is_point_illuminated(self, point: Vector, light_dir: Vector) -> bool:
         """
         Check if a point is illuminated by a point light source.
 
         Notes:
-            - yes, you have to iterate over objects once again
-            - intersect all the objects with the ray starting at the point
-            - return True immediately on having found any intersection
+            - query the scene BVH for any object along the ray starting at the point
+            - return False immediately on having found any intersection
             - don't forget to check that an intersection lies *between* a point and a light source!
             - use shadow consistency trick to cache the last intersecting object and speed up computation
 
@@ -77,7 +108,20 @@ class Scene:
         :return: True, if point is illuminated, or False otherwise
         """
 
-        raise NotImplementedError
+        light_distance = light_dir.length
+        ray = Ray(origin=point, direction=light_dir / light_distance)
+
+        if self._cached_last_intersected is not None:
+            intersection = self._cached_last_intersected.intersect(ray)
+            if intersection is not None and intersection.distance < light_distance:
+                return False
+
+        obj = self.bvh.any_intersection(ray, light_distance)
+        if obj is not None:
+            self._cached_last_intersected = obj
+            return False
+
+        return True
 
     def get_intensity(
         self,
@@ -106,7 +150,29 @@ class Scene:
         :return: an RGB-vector of light intensity with each component normalized to [0; 1]
         """
 
-        raise NotImplementedError
+        material = obj.material
+        intensity = Vector(*material.ambient_color.to_tuple())
+
+        if inside or material.albedo.x <= eps:
+            return intensity
+
+        position, normal = intersection.position, intersection.normal
+        shifted = position + normal * eps
+        local = Vector()
+        for light in self.lights:
+            light_dir = light.origin - position
+            if not self.is_point_illuminated(shifted, light_dir):
+                continue
+
+            light_dir.normalize()
+            diffuse = max(0., normal.dot(light_dir))
+            local += material.diffuse_color.hadamard(light.intensity) * diffuse
+
+            specular = max(0., -ray.direction.dot(reflect(-light_dir, normal)))
+            local += material.specular_color.hadamard(light.intensity) * specular ** material.specular_exponent
+
+        intensity += local * material.albedo.x
+        return intensity
 
     def trace_ray(self, ray: Ray, *, depth: float, inside: bool = False, eps: float = EPS) -> Vector | None:
         """
@@ -127,7 +193,35 @@ class Scene:
         :return: light intensity Nector, or None (if a ray is cast outside the scene)
         """
 
-        raise NotImplementedError
+        intersection, obj = self.find_closest_intersection(ray)
+        if intersection is None:
+            return None
+
+        intensity = self.get_intensity(ray, intersection, obj, inside=inside, eps=eps)
+        if depth <= 1:
+            return intensity
+
+        material = obj.material
+        position, normal = intersection.position, intersection.normal
+
+        if not inside and material.albedo.y > eps:
+            reflected = Ray(origin=position + normal * eps, direction=reflect(ray.direction, normal))
+            pixel = self.trace_ray(reflected, depth=depth - 1, inside=inside, eps=eps)
+            if pixel is not None:
+                intensity += pixel * material.albedo.y
+
+        refraction_weight = 1 if inside else material.albedo.z
+        if refraction_weight > eps:
+            eta = material.refraction_index if inside else 1 / material.refraction_index
+            direction = refract(ray.direction, normal, eta)
+            if direction is not None:
+                refracted = Ray(origin=position - normal * eps, direction=direction)
+                next_inside = not inside if obj.has_volume() else inside
+                pixel = self.trace_ray(refracted, depth=depth - 1, inside=next_inside, eps=eps)
+                if pixel is not None:
+                    intensity += pixel * refraction_weight
+
+        return intensity
 
     def tone_mapping(self, pixels, background_color: Vector, *, eps: float = EPS) -> None:
         """
@@ -143,7 +237,14 @@ class Scene:
         :return: None
         """
 
-        raise NotImplementedError
+        none_mask = np.isclose(pixels, NONE_ARRAY).all(axis=-1)
+        pixels[none_mask] = background_color.to_array()
+
+        max_value = pixels.max()
+        if max_value < eps:
+            return
+
+        pixels *= (1 + pixels / (max_value * max_value)) / (1 + pixels)
 
     def gamma_correction(self, pixels, *, gamma: float = 2.2, eps: float = EPS) -> None:
         """
@@ -158,7 +259,10 @@ class Scene:
         :return: None
         """
 
-        raise NotImplementedError
+        if pixels.max() < eps:
+            return
+
+        np.power(pixels, 1 / gamma, out=pixels)
 
     def postprocess(
         self,
@@ -181,38 +285,167 @@ class Scene:
         eps: float = EPS,
         parallel: bool = False,
         num_workers: int | None = None,
+        tile_size: int = DEFAULT_TILE_SIZE,
+        pool: 'RenderPool | None' = None,
+        engine: str = 'scalar',
     ) -> Image.Image:
+        """
+        Render the scene.
+
+        :param cam_options: camera options
+        :param background_color: color of pixels with no primary intersection (black by default)
+        :param depth: max recursion depth
+        :param verbose: show progress bars
+        :param eps: your god damn EPS
+        :param parallel: trace image tiles in a pool of worker processes (scalar engine only)
+        :param num_workers: number of worker processes
+        :param pool: long-lived RenderPool to trace tiles in instead of a fresh pool (implies parallel)
+        :param tile_size: side length of a square tile handed to a worker at a time
+        :param engine: 'scalar' traces one ray at a time via trace_ray,
+            'vectorized' traces all the rays of a frame as numpy batches bounce by bounce,
+            'wavefront' runs the same batches through separate extend/shadow/shade/spawn queue stages
+            (both batched engines support Sphere and Triangle objects only)
+        :return: rendered image
+        """
+
+        if engine not in ('scalar', 'vectorized', 'wavefront'):
+            raise ValueError(f'Unknown render engine: {engine}')
         if background_color is None:
             background_color = Vector(0, 0, 0)
 
-        global _RENDER_SETTINGS, _SCENE
-        _SCENE = self
-        _RENDER_SETTINGS = RenderSettings(cam_options, eps, depth)
-        width, height = _RENDER_SETTINGS.width, _RENDER_SETTINGS.height
-
-        pixels = np.empty((height, width, 3), dtype=float)
-        if parallel:
-            results = []
-            num_workers = num_workers or multiprocessing.cpu_count() - 1
-            with multiprocessing.Pool(num_workers) as pool:
-                for j in tqdm.tqdm(range(height), desc="Pool preparation", disable=not verbose):
-                    results.append(pool.apply_async(_process_line, (j,)))
-
-                for res in tqdm.tqdm(results, total=len(results), desc="Ray tracing", disable=not verbose):
-                    j, line = res.get()
-                    pixels[j] = line
+        # build the hierarchy before the scene is sent to workers, so that they don't rebuild it
+        self.bvh
+
+        settings = RenderSettings(cam_options, eps, depth)
+        width, height = settings.width, settings.height
+
+        if engine in ('vectorized', 'wavefront'):
+            engine_module = vectorized if engine == 'vectorized' else wavefront
+            pixels, covered = engine_module.render_pixels(self, settings)
+            pixels[~covered] = NONE_ARRAY
+        elif parallel or pool is not None:
+            pixels = np.empty((height, width, 3), dtype=float)
+            tiles = make_tiles(width, height, tile_size)
+            if pool is None:
+                # a one-off pool gets the scene through its initializer, once per worker
+                with RenderPool(num_workers, scene=self) as pool:
+                    _render_tiles(pool, self, settings, tiles, pixels, verbose=verbose)
+            else:
+                _render_tiles(pool, self, settings, tiles, pixels, verbose=verbose)
         else:
+            pixels = np.empty((height, width, 3), dtype=float)
             for j in tqdm.tqdm(range(height), desc="Ray tracing", disable=not verbose):
-                pixels[j] = _process_line(j)[-1]
+                pixels[j] = _trace_line(self, settings, j)
 
         self.postprocess(pixels, background_color, eps=eps)
 
-        img = Image.fromarray(np.uint8(np.clip(0, 255, 256 * pixels)))
+        img = Image.fromarray(np.uint8(np.clip(255 * pixels, 0, 255)))
         return img
 
 
+# worker process state, set by the pool initializer and sync broadcasts only
 _SCENE: 'Scene' = None                     # type: ignore
 _RENDER_SETTINGS: 'RenderSettings' = None  # type: ignore
+_SYNC_BARRIER = None
+_FRAMEBUFFER: shared_memory.SharedMemory | None = None
+_FRAMEBUFFER_PIXELS = None
+
+
+def dump_scene(scene: 'Scene') -> bytes:
+    """
+    Pickle a scene once for all the workers, dropping per-process state.
+
+    Notes:
+        - the BVH is kept, so that workers don't rebuild it
+        - the shadow cache is process-local and is not shipped
+
+    :param scene: Scene instance
+    :return: pickled scene
+    """
+
+    cached = scene._cached_last_intersected
+    scene._cached_last_intersected = None
+    try:
+        return pickle.dumps(scene, protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        scene._cached_last_intersected = cached
+
+
+class RenderPool:
+    """
+    Long-lived pool of worker processes reusable across Scene.render calls.
+
+    Workers keep their copy of the scene between renders and only receive a new one when another scene
+    is rendered or the scene version changes (objects mutated in place are not detected).
+    Render settings and the shared framebuffer of a frame are sent to the workers on every render.
+    Nothing is inherited from the parent process, so the pool works with any start method.
+    """
+
+    def __init__(
+        self,
+        num_workers: int | None = None,
+        *,
+        scene: 'Scene | None' = None,
+        start_method: str | None = None,
+    ):
+        """
+        :param num_workers: number of worker processes
+        :param scene: scene to load into the workers right at startup
+        :param start_method: multiprocessing start method ('fork', 'spawn' or 'forkserver'), platform default if None
+        """
+
+        context = multiprocessing.get_context(start_method)
+        self.num_workers = num_workers or max(1, multiprocessing.cpu_count() - 1)
+        self._barrier = context.Barrier(self.num_workers)
+        self._scene_ref: weakref.ref | None = None
+        self._scene_version: int | None = None
+
+        payload = None
+        if scene is not None:
+            scene.bvh
+            payload = dump_scene(scene)
+            self._scene_ref, self._scene_version = weakref.ref(scene), scene.version
+
+        # workers must share the tracker of the parent, which owns (and unlinks) shared framebuffers
+        resource_tracker.ensure_running()
+        self._pool = context.Pool(self.num_workers, initializer=_init_worker, initargs=(self._barrier, payload))
+
+    def __enter__(self) -> 'RenderPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._pool.terminate()
+        self._pool.join()
+
+    def _broadcast(self, func, payload) -> None:
+        # every worker blocks on the barrier until all of them have taken a task, so each one gets exactly one
+        self._pool.map(func, [payload] * self.num_workers, chunksize=1)
+
+    def sync(self, scene: 'Scene', settings: 'RenderSettings', framebuffer: str | None = None) -> None:
+        """
+        Send render settings to every worker, along with the scene if workers don't hold its current version.
+
+        :param scene: Scene instance (its BVH should already be built)
+        :param settings: RenderSettings instance
+        :param framebuffer: name of a shared memory block holding a float array of shape (height, width, 3)
+        """
+
+        stale = self._scene_ref is None or self._scene_ref() is not scene or self._scene_version != scene.version
+        self._broadcast(_sync_worker, (dump_scene(scene) if stale else None, settings, framebuffer))
+        self._scene_ref, self._scene_version = weakref.ref(scene), scene.version
+
+    def release(self) -> None:
+        """
+        Make every worker detach from the framebuffer of the last frame, so that its memory can be freed.
+        """
+
+        self._broadcast(_release_worker, None)
+
+    def imap_unordered(self, func, iterable):
+        return self._pool.imap_unordered(func, iterable, chunksize=1)
 
 
 @attr.s(slots=True)
@@ -238,21 +471,91 @@ class RenderSettings:
         self.origin = point_matrix_multiply(self.cam_to_world, Vector())
 
 
-def _process_line(j):
-    line = np.empty((_RENDER_SETTINGS.width, 3), dtype=float)
-    for i in range(_RENDER_SETTINGS.width):
-        line[i] = _process_pixel(i, j)
+def _init_worker(barrier, scene: bytes | None) -> None:
+    global _SYNC_BARRIER, _SCENE
+    _SYNC_BARRIER = barrier
+    if scene is not None:
+        _SCENE = pickle.loads(scene)
+
+
+def _detach_framebuffer() -> None:
+    global _FRAMEBUFFER, _FRAMEBUFFER_PIXELS
+    if _FRAMEBUFFER is not None:
+        _FRAMEBUFFER_PIXELS = None
+        _FRAMEBUFFER.close()
+        _FRAMEBUFFER = None
+
+
+def _sync_worker(payload) -> None:
+    global _SCENE, _RENDER_SETTINGS, _FRAMEBUFFER, _FRAMEBUFFER_PIXELS
+    scene, _RENDER_SETTINGS, framebuffer = payload
+    if scene is not None:
+        _SCENE = pickle.loads(scene)
+
+    _detach_framebuffer()
+    if framebuffer is not None:
+        _FRAMEBUFFER = shared_memory.SharedMemory(name=framebuffer)
+        shape = (_RENDER_SETTINGS.height, _RENDER_SETTINGS.width, 3)
+        _FRAMEBUFFER_PIXELS = np.ndarray(shape, dtype=float, buffer=_FRAMEBUFFER.buf)
+
+    _SYNC_BARRIER.wait()
+
+
+def _release_worker(_) -> None:
+    _detach_framebuffer()
+    _SYNC_BARRIER.wait()
+
+
+def _render_tiles(
+    pool: RenderPool,
+    scene: Scene,
+    settings: RenderSettings,
+    tiles: list[Tile],
+    pixels,
+    *,
+    verbose: bool,
+) -> None:
+    framebuffer = shared_memory.SharedMemory(create=True, size=pixels.nbytes)
+    try:
+        pool.sync(scene, settings, framebuffer.name)
+
+        # idle workers pull the next tile along the curve, so costly tiles don't hold up the frame,
+        # finished tiles are written straight into the framebuffer and only tile bounds travel back
+        results = pool.imap_unordered(_process_tile, tiles)
+        for _ in tqdm.tqdm(results, total=len(tiles), desc="Ray tracing", disable=not verbose):
+            pass
+
+        pool.release()
+        pixels[:] = np.ndarray(pixels.shape, dtype=float, buffer=framebuffer.buf)
+    finally:
+        framebuffer.close()
+        framebuffer.unlink()
+
+
+def _process_tile(tile: Tile) -> Tile:
+    block = _FRAMEBUFFER_PIXELS[tile.y0:tile.y1, tile.x0:tile.x1]
+    for j in range(tile.y0, tile.y1):
+        for i in range(tile.x0, tile.x1):
+            block[j - tile.y0, i - tile.x0] = _trace_pixel(_SCENE, _RENDER_SETTINGS, i, j)
+
+    return tile
+
+
+def _trace_line(scene: Scene, settings: RenderSettings, j: int):
+    line = np.empty((settings.width, 3), dtype=float)
+    for i in range(settings.width):
+        line[i] = _trace_pixel(scene, settings, i, j)
 
-    return j, line
+    return line
 
 
-def _process_pixel(i, j):
-    x = (2 * (i + 0.5) / _RENDER_SETTINGS.width - 1) * _RENDER_SETTINGS.aspect_ratio * _RENDER_SETTINGS.scale
-    y = (1 - 2 * (j + 0.5) / _RENDER_SETTINGS.height) * _RENDER_SETTINGS.scale
-    direction = vector_matrix_multiply(_RENDER_SETTINGS.cam_to_world, Vector(x, y, -1))
-    ray = Ray(origin=_RENDER_SETTINGS.origin, direction=direction)
+def _trace_pixel(scene: Scene, settings: RenderSettings, i: int, j: int):
+    x = (2 * (i + 0.5) / settings.width - 1) * settings.aspect_ratio * settings.scale
+    y = (1 - 2 * (j + 0.5) / settings.height) * settings.scale
+    direction = vector_matrix_multiply(settings.cam_to_world, Vector(x, y, -1))
+    ray = Ray(origin=settings.origin, direction=direction)
 
-    pixel = _SCENE.trace_ray(ray, depth=_RENDER_SETTINGS.depth, eps=_RENDER_SETTINGS.eps)
+    pixel = scene.trace_ray(ray, depth=settings.depth, eps=settings.eps)
     if pixel is None:
         pixel = NONE_VECTOR
 
@@ -1,12 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
 import math
 import numpy as np
 import os
 from pathlib import Path
 from PIL import Image
+import pytest
 import time
 
 from ...geometry import Material, Sphere, Triangle, Vector
-from .. import CameraOptions, PointLight, Scene
+from .. import CameraOptions, PointLight, RenderPool, Scene
 
 
 CURDIR = Path(os.path.relpath(__file__)).parent
@@ -20,11 +22,12 @@ def check_image(
     parallel: bool = True,
     timeout: float | None = None,
     artifact_path: str | Path | None = None,
+    engine: str = 'scalar',
 ) -> None:
     orig = Image.open(filename).convert('RGB')
 
     start_time = time.time()
-    img = scene.render(cam_options, depth=depth, parallel=parallel, verbose=False)
+    img = scene.render(cam_options, depth=depth, parallel=parallel, verbose=False, engine=engine)
     end_time = time.time()
 
     if artifact_path is not None:
@@ -40,8 +43,13 @@ def check_image(
     assert timeout is None or end_time - start_time < timeout
 
 
+@pytest.fixture(params=['scalar', 'vectorized', 'wavefront'])
+def engine(request):
+    return request.param
+
+
 class TestRender:
-    def test_sphere(self):
+    def test_sphere(self, engine):
         scene = Scene()
 
         # materials
@@ -93,10 +101,11 @@ class TestRender:
             depth=1,
             parallel=True,
             timeout=15,
-            artifact_path=CURDIR / 'artifacts/spheres.png'
+            artifact_path=CURDIR / f'artifacts/spheres_{engine}.png',
+            engine=engine,
         )
 
-    def test_triangle(self):
+    def test_triangle(self, engine):
         scene = Scene()
 
         # materials
@@ -134,10 +143,11 @@ class TestRender:
             depth=1,
             parallel=True,
             timeout=15,
-            artifact_path=CURDIR / 'artifacts/triangle.png'
+            artifact_path=CURDIR / f'artifacts/triangle_{engine}.png',
+            engine=engine,
         )
 
-    def test_invisible_triangle(self):
+    def test_invisible_triangle(self, engine):
         scene = Scene()
 
         # materials
@@ -175,10 +185,11 @@ class TestRender:
             depth=1,
             parallel=True,
             timeout=15,
-            artifact_path=CURDIR / 'artifacts/invisible_triangle.png'
+            artifact_path=CURDIR / f'artifacts/invisible_triangle_{engine}.png',
+            engine=engine,
         )
 
-    def test_box(self):
+    def test_box(self, engine):
         scene = Scene()
 
         # materials
@@ -339,10 +350,11 @@ class TestRender:
             depth=4,
             parallel=True,
             timeout=30,
-            artifact_path=CURDIR / 'artifacts/box.png'
+            artifact_path=CURDIR / f'artifacts/box_{engine}.png',
+            engine=engine,
         )
 
-    def test_mirrors(self):
+    def test_mirrors(self, engine):
         scene = Scene()
 
         # materials
@@ -512,5 +524,65 @@ class TestRender:
             depth=9,
             parallel=True,
             timeout=90,
-            artifact_path=CURDIR / 'artifacts/mirrors.png'
+            artifact_path=CURDIR / f'artifacts/mirrors_{engine}.png',
+            engine=engine,
         )
+
+
+def make_small_scene(color: Vector) -> tuple[Scene, CameraOptions]:
+    scene = Scene()
+    scene.add_object(Sphere(
+        center=Vector(0, 0, -1),
+        radius=0.5,
+        material=Material(diffuse_color=color),
+    ))
+    scene.add_light(PointLight(
+        origin=Vector(1, 1, 0),
+        intensity=Vector(1),
+    ))
+    cam_options = CameraOptions(
+        screen_width=64,
+        screen_height=48,
+    )
+    return scene, cam_options
+
+
+class TestRenderPool:
+    def test_reuse(self):
+        scene, cam_options = make_small_scene(Vector(0.5, 0.2, 0))
+
+        with RenderPool(2) as pool:
+            for _ in range(2):
+                img = scene.render(cam_options, depth=1, verbose=False, pool=pool, tile_size=16)
+                expected = scene.render(cam_options, depth=1, verbose=False)
+                assert np.array_equal(np.asarray(img), np.asarray(expected))
+
+                # the next frame should see the update
+                scene.add_object(Sphere(
+                    center=Vector(0.5, 0.3, -0.8),
+                    radius=0.2,
+                    material=Material(ambient_color=Vector(0, 0, 1)),
+                ))
+
+    @pytest.mark.parametrize('start_method', ['spawn', 'forkserver'])
+    def test_start_methods(self, start_method):
+        scene, cam_options = make_small_scene(Vector(0.5, 0.2, 0))
+        expected = scene.render(cam_options, depth=1, verbose=False)
+
+        with RenderPool(2, scene=scene, start_method=start_method) as pool:
+            img = scene.render(cam_options, depth=1, verbose=False, pool=pool, tile_size=16)
+        assert np.array_equal(np.asarray(img), np.asarray(expected))
+
+    def test_concurrent_renders(self):
+        scenes = [make_small_scene(Vector(0.5, 0.2, 0)), make_small_scene(Vector(0, 0.2, 0.5))]
+        expected = [scene.render(cam_options, depth=1, verbose=False) for scene, cam_options in scenes]
+
+        with ThreadPoolExecutor(len(scenes)) as executor:
+            futures = [
+                executor.submit(scene.render, cam_options, depth=1, verbose=False, parallel=True, num_workers=2)
+                for scene, cam_options in scenes
+            ]
+            images = [future.result() for future in futures]
+
+        for img, orig in zip(images, expected):
+            assert np.array_equal(np.asarray(img), np.asarray(orig))
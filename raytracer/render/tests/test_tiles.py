@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from ..tiles import hilbert_index, make_tiles
+
+
+class TestTiles:
+    @pytest.mark.parametrize('width, height, tile_size', [(640, 480, 32), (100, 37, 16), (5, 3, 8)])
+    def test_cover_image_once(self, width, height, tile_size):
+        coverage = np.zeros((height, width), dtype=int)
+        for tile in make_tiles(width, height, tile_size):
+            assert 0 < tile.width <= tile_size
+            assert 0 < tile.height <= tile_size
+            coverage[tile.y0:tile.y1, tile.x0:tile.x1] += 1
+
+        assert (coverage == 1).all()
+
+    def test_hilbert_order(self):
+        order = 8
+        cells = sorted(((x, y) for x in range(order) for y in range(order)), key=lambda c: hilbert_index(*c, order))
+        assert cells[0] == (0, 0)
+        for (x0, y0), (x1, y1) in zip(cells, cells[1:]):
+            assert abs(x0 - x1) + abs(y0 - y1) == 1
+
+    def test_invalid_tile_size(self):
+        with pytest.raises(ValueError):
+            make_tiles(10, 10, 0)
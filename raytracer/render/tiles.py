@@ -0,0 +1,79 @@
+import attr
+
+
+DEFAULT_TILE_SIZE = 32
+
+
+@attr.s(slots=True, frozen=True)
+class Tile:
+    x0: int = attr.ib()
+    y0: int = attr.ib()
+    x1: int = attr.ib()
+    y1: int = attr.ib()
+
+    @property
+    def width(self) -> int:
+        return self.x1 - self.x0
+
+    @property
+    def height(self) -> int:
+        return self.y1 - self.y0
+
+
+def hilbert_index(x: int, y: int, order: int) -> int:
+    """
+    Calculate the position of a cell along the Hilbert curve filling a square grid.
+
+    :param x: cell column
+    :param y: cell row
+    :param order: grid side length (a power of two)
+    :return: distance of the cell from the start of the curve
+    """
+
+    d = 0
+    s = order // 2
+    while s > 0:
+        rx = int(x & s > 0)
+        ry = int(y & s > 0)
+        d += s * s * ((3 * rx) ^ ry)
+        if ry == 0:
+            if rx == 1:
+                x, y = s - 1 - x, s - 1 - y
+            x, y = y, x
+        s //= 2
+    return d
+
+
+def make_tiles(width: int, height: int, tile_size: int = DEFAULT_TILE_SIZE) -> list[Tile]:
+    """
+    Split an image into square tiles ordered along a Hilbert curve.
+
+    Notes:
+        - tiles on the right and bottom borders are cropped to the image
+        - consecutive tiles are (almost always) neighbours, so workers picking tiles in order trace nearby rays
+
+    :param width: image width
+    :param height: image height
+    :param tile_size: side length of a tile in pixels
+    :return: list of tiles covering the image
+    """
+
+    if tile_size < 1:
+        raise ValueError(f'Tile size should be positive, got {tile_size}')
+
+    cols = -(-width // tile_size)
+    rows = -(-height // tile_size)
+    order = 1
+    while order < max(cols, rows):
+        order *= 2
+
+    cells = sorted(((i, j) for j in range(rows) for i in range(cols)), key=lambda c: hilbert_index(*c, order))
+    return [
+        Tile(
+            i * tile_size,
+            j * tile_size,
+            min((i + 1) * tile_size, width),
+            min((j + 1) * tile_size, height),
+        )
+        for i, j in cells
+    ]
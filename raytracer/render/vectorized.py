@@ -0,0 +1,400 @@
+import attr
+import math
+import numpy as np
+
+from ..geometry import BaseObject, Sphere, Triangle, VectorArray, reflect
+
+
+MAX_BATCH_ELEMENTS = 1 << 18
+
+
+@attr.s(slots=True, kw_only=True)
+class PackedScene:
+    """
+    Scene objects and their materials packed into numpy arrays, indexed by the object position in Scene.objects.
+    """
+
+    num_objects: int = attr.ib()
+
+    sphere_ids = attr.ib()
+    sphere_centers = attr.ib()
+    sphere_radii = attr.ib()
+
+    triangle_ids = attr.ib()
+    triangle_origins = attr.ib()
+    triangle_edges1 = attr.ib()
+    triangle_edges2 = attr.ib()
+    triangle_normals = attr.ib()
+
+    ambient_color = attr.ib()
+    diffuse_color = attr.ib()
+    specular_color = attr.ib()
+    specular_exponent = attr.ib()
+    refraction_index = attr.ib()
+    albedo = attr.ib()
+    has_volume = attr.ib()
+
+    light_origins = attr.ib()
+    light_intensities = attr.ib()
+
+    @classmethod
+    def from_scene(cls, objects: list[BaseObject], lights) -> "PackedScene":
+        spheres, triangles = [], []
+        for idx, obj in enumerate(objects):
+            if type(obj) is Sphere:
+                spheres.append(idx)
+            elif type(obj) is Triangle:
+                triangles.append(idx)
+            else:
+                raise RuntimeError(f'Vectorized engine does not support {type(obj).__name__} objects.')
+
+        vertices = np.array([[v.to_tuple() for v in objects[idx]] for idx in triangles], dtype=float).reshape(-1, 3, 3)
+        edges1 = vertices[:, 1] - vertices[:, 0]
+        edges2 = vertices[:, 2] - vertices[:, 0]
+
+        def pack(getter, shape=(3,)):
+            return np.array([getter(obj.material) for obj in objects], dtype=float).reshape(-1, *shape)
+
+        return cls(
+            num_objects=len(objects),
+            sphere_ids=np.array(spheres, dtype=int),
+            sphere_centers=np.array([objects[idx].center.to_tuple() for idx in spheres], dtype=float).reshape(-1, 3),
+            sphere_radii=np.array([objects[idx].radius for idx in spheres], dtype=float),
+            triangle_ids=np.array(triangles, dtype=int),
+            triangle_origins=vertices[:, 0],
+            triangle_edges1=edges1,
+            triangle_edges2=edges2,
+            triangle_normals=VectorArray(np.cross(edges1, edges2)).normalize().to_array(),
+            ambient_color=pack(lambda m: m.ambient_color.to_tuple()),
+            diffuse_color=pack(lambda m: m.diffuse_color.to_tuple()),
+            specular_color=pack(lambda m: m.specular_color.to_tuple()),
+            specular_exponent=pack(lambda m: m.specular_exponent, ()),
+            refraction_index=pack(lambda m: m.refraction_index, ()),
+            albedo=pack(lambda m: m.albedo.to_tuple()),
+            has_volume=np.array([obj.has_volume() for obj in objects], dtype=bool),
+            light_origins=np.array([light.origin.to_tuple() for light in lights], dtype=float).reshape(-1, 3),
+            light_intensities=np.array([light.intensity.to_tuple() for light in lights], dtype=float).reshape(-1, 3),
+        )
+
+    def distances(self, origins, directions, *, eps: float):
+        """
+        Intersect a batch of rays with every object in the scene.
+
+        Notes:
+            - follows Sphere.intersect and Triangle.intersect exactly, including rays spawned inside a sphere
+            - missed objects get an infinite distance
+
+        :param origins: ray origins of shape (n, 3)
+        :param directions: unit ray directions of shape (n, 3)
+        :param eps: EPS of the Moller-Trumbore test
+        :return: array of distances of shape (n, num_objects)
+        """
+
+        distances = np.full((len(origins), self.num_objects), math.inf)
+
+        if len(self.sphere_ids):
+            to_origin = origins[:, None, :] - self.sphere_centers
+            a = np.einsum('ij,ij->i', directions, directions)[:, None]
+            b = 2 * np.einsum('ik,ijk->ij', directions, to_origin)
+            c = np.einsum('ijk,ijk->ij', to_origin, to_origin) - self.sphere_radii ** 2
+            discriminant = b * b - 4 * a * c
+            valid = discriminant >= 0
+            sqrt_d = np.sqrt(np.where(valid, discriminant, 0))
+            t1 = (-b - sqrt_d) / (2 * a)
+            t2 = (-b + sqrt_d) / (2 * a)
+            valid &= t2 >= 0
+            distances[:, self.sphere_ids] = np.where(valid, np.where(t1 < 0, t2, t1), math.inf)
+
+        if len(self.triangle_ids):
+            d = directions[:, None, :]
+            p = np.cross(d, self.triangle_edges2)
+            det = np.einsum('jk,ijk->ij', self.triangle_edges1, p)
+            valid = np.abs(det) >= eps
+            inv_det = 1 / np.where(valid, det, 1)
+            s = origins[:, None, :] - self.triangle_origins
+            u = np.einsum('ijk,ijk->ij', s, p) * inv_det
+            q = np.cross(s, self.triangle_edges1)
+            v = np.einsum('ijk,ijk->ij', np.broadcast_to(d, q.shape), q) * inv_det
+            t = np.einsum('jk,ijk->ij', self.triangle_edges2, q) * inv_det
+            valid &= (u >= 0) & (u <= 1) & (v >= 0) & (u + v <= 1) & (t >= eps)
+            distances[:, self.triangle_ids] = np.where(valid, t, math.inf)
+
+        return distances
+
+    def _batches(self, n: int):
+        step = max(1, MAX_BATCH_ELEMENTS // max(1, self.num_objects))
+        for start in range(0, n, step):
+            yield slice(start, min(n, start + step))
+
+    def closest(self, origins, directions, *, eps: float):
+        """
+        Find the closest object along each ray.
+
+        :return: tuple of distances (inf on miss) and object indices (-1 on miss), both of shape (n,)
+        """
+
+        distance = np.full(len(origins), math.inf)
+        obj = np.full(len(origins), -1, dtype=int)
+        for batch in self._batches(len(origins)):
+            distances = self.distances(origins[batch], directions[batch], eps=eps)
+            if not self.num_objects:
+                continue
+            obj[batch] = distances.argmin(axis=1)
+            distance[batch] = distances[np.arange(len(distances)), obj[batch]]
+
+        obj[np.isinf(distance)] = -1
+        return distance, obj
+
+    def occluded(self, origins, directions, max_distance, *, eps: float):
+        """
+        Check if each ray hits any object closer than the given distance.
+
+        :return: boolean array of shape (n,)
+        """
+
+        result = np.zeros(len(origins), dtype=bool)
+        for batch in self._batches(len(origins)):
+            distances = self.distances(origins[batch], directions[batch], eps=eps)
+            result[batch] = (distances < max_distance[batch, None]).any(axis=1)
+        return result
+
+    def normals(self, positions, directions, obj):
+        """
+        Compute normals at hit positions facing against the rays, the same way objects' intersect() methods do.
+
+        :return: array of normals of shape (n, 3)
+        """
+
+        normals = np.empty_like(positions)
+
+        sphere_of = np.full(self.num_objects, -1, dtype=int)
+        sphere_of[self.sphere_ids] = np.arange(len(self.sphere_ids))
+        triangle_of = np.full(self.num_objects, -1, dtype=int)
+        triangle_of[self.triangle_ids] = np.arange(len(self.triangle_ids))
+
+        is_sphere = sphere_of[obj] >= 0
+        if is_sphere.any():
+            k = sphere_of[obj[is_sphere]]
+            normals[is_sphere] = (positions[is_sphere] - self.sphere_centers[k]) / self.sphere_radii[k, None]
+
+        is_triangle = ~is_sphere
+        if is_triangle.any():
+            normals[is_triangle] = self.triangle_normals[triangle_of[obj[is_triangle]]]
+
+        normals[np.einsum('ij,ij->i', normals, directions) > 0] *= -1
+        return normals
+
+
+def refract(directions, normals, eta):
+    """
+    Refract a batch of rays, see geometry.refract.
+
+    :return: tuple of refracted directions and a mask of rays that were not totally reflected
+    """
+
+    cos_in = -np.einsum('ij,ij->i', directions, normals)
+    sin2_out = eta * eta * (1 - cos_in * cos_in)
+    valid = sin2_out <= 1
+    cos_out = np.sqrt(np.where(valid, 1 - sin2_out, 0))
+    return directions * eta[:, None] + normals * (eta * cos_in - cos_out)[:, None], valid
+
+
+@attr.s(slots=True, kw_only=True)
+class RayBatch:
+    origins = attr.ib()
+    directions = attr.ib()
+    pixels = attr.ib()
+    weights = attr.ib()
+    inside = attr.ib()
+
+    def __len__(self) -> int:
+        return len(self.pixels)
+
+
+def camera_rays(settings) -> RayBatch:
+    """
+    Generate primary rays for all pixels in row-major order, see _trace_pixel.
+
+    :param settings: RenderSettings instance
+    :return: batch of camera rays
+    """
+
+    width, height = settings.width, settings.height
+    x = (2 * (np.arange(width) + 0.5) / width - 1) * settings.aspect_ratio * settings.scale
+    y = (1 - 2 * (np.arange(height) + 0.5) / height) * settings.scale
+
+    camera = np.empty((height, width, 3), dtype=float)
+    camera[..., 0] = x
+    camera[..., 1] = y[:, None]
+    camera[..., 2] = -1
+
+    directions = VectorArray(camera.reshape(-1, 3) @ settings.cam_to_world[:3, :3]).normalize().to_array()
+    n = len(directions)
+    return RayBatch(
+        origins=np.broadcast_to(settings.origin.to_array(), (n, 3)),
+        directions=directions,
+        pixels=np.arange(n),
+        weights=np.ones(n),
+        inside=np.zeros(n, dtype=bool),
+    )
+
+
+def get_intensity(packed: PackedScene, positions, normals, directions, obj, inside, *, eps: float):
+    """
+    Calculate light intensity at a batch of hit points, see Scene.get_intensity.
+
+    :return: array of intensities of shape (n, 3)
+    """
+
+    intensity = packed.ambient_color[obj].copy()
+
+    lit = ~inside & (packed.albedo[obj, 0] > eps)
+    if not lit.any() or not len(packed.light_origins):
+        return intensity
+
+    positions, normals, directions, obj = positions[lit], normals[lit], directions[lit], obj[lit]
+    shifted = positions + normals * eps
+    local = np.zeros_like(positions)
+    for light_origin, light_intensity in zip(packed.light_origins, packed.light_intensities):
+        light_dir = VectorArray(light_origin - positions)
+        light_distance = light_dir.length
+        light_dir.normalize()
+
+        visible = ~packed.occluded(shifted, light_dir.to_array(), light_distance, eps=eps)
+        light_dir = light_dir[visible]
+        n, d, k = VectorArray(normals[visible]), directions[visible], obj[visible]
+
+        diffuse = np.maximum(0., n.dot(light_dir))
+        local[visible] += packed.diffuse_color[k] * light_intensity * diffuse[:, None]
+
+        specular = np.maximum(0., -np.einsum('ij,ij->i', d, reflect(-light_dir, n).to_array()))
+        specular **= packed.specular_exponent[k]
+        local[visible] += packed.specular_color[k] * light_intensity * specular[:, None]
+
+    intensity[lit] += local * packed.albedo[obj, 0, None]
+    return intensity
+
+
+@attr.s(slots=True, kw_only=True)
+class HitBatch:
+    positions = attr.ib()
+    normals = attr.ib()
+    directions = attr.ib()
+    obj = attr.ib()
+    pixels = attr.ib()
+    weights = attr.ib()
+    inside = attr.ib()
+
+    def __len__(self) -> int:
+        return len(self.pixels)
+
+
+def find_hits(packed: PackedScene, rays: RayBatch, *, eps: float) -> HitBatch:
+    """
+    Intersect a batch of rays with the scene, dropping the rays that miss it.
+
+    :return: batch of hits
+    """
+
+    distance, obj = packed.closest(rays.origins, rays.directions, eps=eps)
+    hit = obj >= 0
+
+    directions, obj = rays.directions[hit], obj[hit]
+    positions = rays.origins[hit] + directions * distance[hit, None]
+    return HitBatch(
+        positions=positions,
+        normals=packed.normals(positions, directions, obj),
+        directions=directions,
+        obj=obj,
+        pixels=rays.pixels[hit],
+        weights=rays.weights[hit],
+        inside=rays.inside[hit],
+    )
+
+
+def spawn_rays(packed: PackedScene, hits: HitBatch, *, eps: float) -> RayBatch:
+    """
+    Spawn reflected and refracted rays for a batch of hits, see Scene.trace_ray.
+
+    :return: batch of secondary rays with weights multiplied by the corresponding albedo
+    """
+
+    albedo = packed.albedo[hits.obj]
+    reflects = ~hits.inside & (albedo[:, 1] > eps)
+    reflected = reflect(VectorArray(hits.directions[reflects]), VectorArray(hits.normals[reflects])).normalize()
+
+    refraction_weight = np.where(hits.inside, 1, albedo[:, 2])
+    refracts = refraction_weight > eps
+    refraction_index = packed.refraction_index[hits.obj]
+    eta = np.where(hits.inside, refraction_index, 1 / refraction_index)[refracts]
+    refracted, valid = refract(hits.directions[refracts], hits.normals[refracts], eta)
+    refracts[refracts] = valid
+    refracted = VectorArray(refracted[valid]).normalize()
+
+    return RayBatch(
+        origins=np.concatenate((
+            hits.positions[reflects] + hits.normals[reflects] * eps,
+            hits.positions[refracts] - hits.normals[refracts] * eps,
+        )),
+        directions=np.concatenate((reflected.to_array(), refracted.to_array())),
+        pixels=np.concatenate((hits.pixels[reflects], hits.pixels[refracts])),
+        weights=np.concatenate((
+            hits.weights[reflects] * albedo[reflects, 1],
+            hits.weights[refracts] * refraction_weight[refracts],
+        )),
+        inside=np.concatenate((
+            hits.inside[reflects],
+            hits.inside[refracts] ^ packed.has_volume[hits.obj[refracts]],
+        )),
+    )
+
+
+def trace_rays(packed: PackedScene, rays: RayBatch, num_pixels: int, *, depth: float, eps: float):
+    """
+    Trace a batch of rays over the scene, see Scene.trace_ray.
+
+    Notes:
+        - recursion is unrolled into bounces: every bounce is a (shrinking) batch of weighted rays
+        - a pixel accumulates the weighted local intensity of every hit along all of its ray paths
+
+    :return: tuple of pixel intensities of shape (num_pixels, 3) and a mask of pixels with a primary hit
+    """
+
+    result = np.zeros((num_pixels, 3), dtype=float)
+    covered = np.zeros(num_pixels, dtype=bool)
+
+    primary = True
+    while len(rays):
+        hits = find_hits(packed, rays, eps=eps)
+        if primary:
+            covered[hits.pixels] = True
+            primary = False
+
+        intensity = get_intensity(
+            packed, hits.positions, hits.normals, hits.directions, hits.obj, hits.inside, eps=eps,
+        )
+        np.add.at(result, hits.pixels, intensity * hits.weights[:, None])
+
+        if depth <= 1:
+            break
+        depth -= 1
+
+        rays = spawn_rays(packed, hits, eps=eps)
+
+    return result, covered
+
+
+def render_pixels(scene, settings):
+    """
+    Render a whole frame with batched numpy operations.
+
+    :param scene: Scene instance
+    :param settings: RenderSettings instance
+    :return: tuple of pixel intensities of shape (height, width, 3) and a coverage mask of shape (height, width)
+    """
+
+    packed = PackedScene.from_scene(scene.objects, scene.lights)
+    rays = camera_rays(settings)
+    result, covered = trace_rays(packed, rays, len(rays), depth=settings.depth, eps=settings.eps)
+    shape = (settings.height, settings.width)
+    return result.reshape(*shape, 3), covered.reshape(shape)
@@ -0,0 +1,179 @@
+import attr
+import numpy as np
+
+from ..geometry import VectorArray, reflect
+from .vectorized import HitBatch, PackedScene, RayBatch, camera_rays, find_hits, spawn_rays
+
+
+@attr.s(slots=True, kw_only=True)
+class ShadowQueue:
+    """
+    Shadow rays from lit hit points towards every light source, one entry per (hit, light) pair.
+    """
+
+    hits = attr.ib()
+    lights = attr.ib()
+    origins = attr.ib()
+    directions = attr.ib()
+    max_distance = attr.ib()
+    visible = attr.ib(default=None)
+
+    def __len__(self) -> int:
+        return len(self.hits)
+
+
+@attr.s(slots=True)
+class WavefrontStats:
+    """
+    Queue sizes of every bounce: rays extended, rays that hit the scene, shadow rays cast and rays spawned.
+    """
+
+    extended: list[int] = attr.ib(factory=list)
+    hits: list[int] = attr.ib(factory=list)
+    shadow: list[int] = attr.ib(factory=list)
+    spawned: list[int] = attr.ib(factory=list)
+
+    @property
+    def total_rays(self) -> int:
+        return sum(self.extended) + sum(self.shadow)
+
+
+def generate(settings) -> RayBatch:
+    """
+    Generate the queue of camera rays, one per pixel.
+    """
+
+    return camera_rays(settings)
+
+
+def extend(packed: PackedScene, rays: RayBatch, *, eps: float) -> HitBatch:
+    """
+    Find the closest hit of every queued ray, rays that leave the scene are dropped.
+    """
+
+    return find_hits(packed, rays, eps=eps)
+
+
+def shadow(packed: PackedScene, hits: HitBatch, *, eps: float) -> ShadowQueue:
+    """
+    Build the shadow ray queue of a batch of hits and resolve it with a single occlusion kernel.
+
+    Notes:
+        - only hits outside of objects with material.albedo.x > EPS are shaded by lights (see Scene.get_intensity)
+        - shadow rays start at a point shifted by EPS along the normal
+
+    :return: shadow queue with the visibility mask filled in
+    """
+
+    lit = np.flatnonzero(~hits.inside & (packed.albedo[hits.obj, 0] > eps))
+    num_lights = len(packed.light_origins)
+
+    hit_idx = np.repeat(lit, num_lights)
+    light_idx = np.tile(np.arange(num_lights), len(lit))
+    positions = hits.positions[hit_idx]
+
+    directions = VectorArray(packed.light_origins[light_idx] - positions)
+    max_distance = directions.length
+    directions.normalize()
+
+    queue = ShadowQueue(
+        hits=hit_idx,
+        lights=light_idx,
+        origins=positions + hits.normals[hit_idx] * eps,
+        directions=directions.to_array(),
+        max_distance=max_distance,
+    )
+    queue.visible = ~packed.occluded(queue.origins, queue.directions, queue.max_distance, eps=eps)
+    return queue
+
+
+def shade(packed: PackedScene, hits: HitBatch, shadows: ShadowQueue):
+    """
+    Calculate light intensity at a batch of hits given resolved shadow rays, see Scene.get_intensity.
+
+    :return: array of intensities of shape (n, 3)
+    """
+
+    intensity = packed.ambient_color[hits.obj].copy()
+
+    visible = shadows.visible
+    hit_idx, light_idx = shadows.hits[visible], shadows.lights[visible]
+    obj = hits.obj[hit_idx]
+    light_dir = VectorArray(shadows.directions[visible])
+    normals = VectorArray(hits.normals[hit_idx])
+    light_intensity = packed.light_intensities[light_idx]
+
+    diffuse = np.maximum(0., normals.dot(light_dir))
+    specular = np.maximum(0., -np.einsum('ij,ij->i', hits.directions[hit_idx], reflect(-light_dir, normals).to_array()))
+    specular **= packed.specular_exponent[obj]
+    contribution = packed.diffuse_color[obj] * light_intensity * diffuse[:, None]
+    contribution += packed.specular_color[obj] * light_intensity * specular[:, None]
+
+    local = np.zeros_like(intensity)
+    np.add.at(local, hit_idx, contribution)
+    intensity += local * packed.albedo[hits.obj, 0, None]
+    return intensity
+
+
+def trace_wavefront(
+    packed: PackedScene,
+    rays: RayBatch,
+    num_pixels: int,
+    *,
+    depth: float,
+    eps: float,
+    stats: WavefrontStats | None = None,
+):
+    """
+    Trace a queue of rays over the scene stage by stage.
+
+    Notes:
+        - every bounce runs extend -> shadow -> shade -> spawn, each stage is one batched kernel over its queue
+        - rays that leave the scene or whose path ends drop out of the queues of later bounces
+
+    :return: tuple of pixel intensities of shape (num_pixels, 3) and a mask of pixels with a primary hit
+    """
+
+    result = np.zeros((num_pixels, 3), dtype=float)
+    covered = np.zeros(num_pixels, dtype=bool)
+
+    primary = True
+    while len(rays):
+        hits = extend(packed, rays, eps=eps)
+        if primary:
+            covered[hits.pixels] = True
+            primary = False
+
+        shadows = shadow(packed, hits, eps=eps)
+        np.add.at(result, hits.pixels, shade(packed, hits, shadows) * hits.weights[:, None])
+
+        next_rays = spawn_rays(packed, hits, eps=eps) if depth > 1 else None
+        if stats is not None:
+            stats.extended.append(len(rays))
+            stats.hits.append(len(hits))
+            stats.shadow.append(len(shadows))
+            stats.spawned.append(0 if next_rays is None else len(next_rays))
+
+        if next_rays is None:
+            break
+        rays = next_rays
+        depth -= 1
+
+    return result, covered
+
+
+def render_pixels(scene, settings, *, stats: WavefrontStats | None = None):
+    """
+    Render a whole frame with the wavefront pipeline.
+
+    :param scene: Scene instance
+    :param settings: RenderSettings instance
+    :param stats: if given, filled with queue sizes of every bounce
+    :return: tuple of pixel intensities of shape (height, width, 3) and a coverage mask of shape (height, width)
+    """
+
+    packed = PackedScene.from_scene(scene.objects, scene.lights)
+    rays = generate(settings)
+    result, covered = trace_wavefront(packed, rays, len(rays), depth=settings.depth, eps=settings.eps, stats=stats)
+    shape = (settings.height, settings.width)
+    return result.reshape(*shape, 3), covered.reshape(shape)